@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Approval Verdict Cache
+Persists Grok verdicts keyed by (tool_name, tool_input, cwd) so repeated operations skip the LLM call
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Optional
+
+import hook_utils
+
+
+CACHE_FILE = os.path.expanduser("~/.opcode-cache/approvals.json")
+
+# Cached verdicts expire after a day so prompt/model changes eventually take effect
+CACHE_TTL = 24 * 60 * 60
+
+# Bash commands matching this are always re-judged, never served from or written to the cache
+UNCACHEABLE_BASH = re.compile(
+    r"\b(rm|rmdir|mv|dd|mkfs(\.\w+)?|shred|truncate|chmod|chown|kill|pkill|killall|sudo|reboot|shutdown)\b"
+    r"|\bgit\s+(push|reset|clean|rebase|checkout|branch\s+-D)\b"
+    r"|\b(DROP|TRUNCATE)\s+(TABLE|DATABASE)\b|\bDELETE\s+FROM\b",
+    re.IGNORECASE,
+)
+
+
+def make_key(tool_name: str, tool_input: Dict[str, Any], cwd: str) -> str:
+    """
+    Build the cache key for a tool operation
+
+    Args:
+        tool_name: Name of the tool being called
+        tool_input: Input parameters for the tool
+        cwd: Current working directory
+
+    Returns:
+        SHA-256 hex digest of the canonical JSON form of the operation
+    """
+    canonical = json.dumps({"t": tool_name, "i": tool_input, "c": cwd}, sort_keys=True)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def is_cacheable(tool_name: str, tool_input: Dict[str, Any]) -> bool:
+    """
+    Check whether a verdict for this operation may be cached
+
+    Args:
+        tool_name: Name of the tool being called
+        tool_input: Input parameters for the tool
+
+    Returns:
+        False for Bash commands containing destructive tokens, True otherwise
+    """
+    if tool_name == "Bash":
+        return not UNCACHEABLE_BASH.search(str(tool_input.get("command", "")))
+    return True
+
+
+def _read_cache(f) -> Dict[str, Any]:
+    try:
+        data = hook_utils.json_loads(f.read() or b"{}")
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def get_verdict(key: str) -> Optional[str]:
+    """
+    Look up a cached verdict
+
+    Args:
+        key: Cache key from make_key()
+
+    Returns:
+        Cached decision ("allow", "deny" or "ask"), or None on miss or expiry
+    """
+    try:
+        with open(CACHE_FILE, 'rb') as f:
+            entry = _read_cache(f).get(key)
+    except IOError:
+        return None
+
+    if not entry or time.time() - entry.get("ts", 0) >= CACHE_TTL:
+        return None
+    return entry.get("decision")
+
+
+def put_verdict(key: str, decision: str) -> None:
+    """
+    Persist a verdict, pruning expired entries in the same write
+
+    Args:
+        key: Cache key from make_key()
+        decision: Decision returned by Grok
+    """
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        fd = os.open(CACHE_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, 'rb+') as f:
+            hook_utils.acquire_lock(f)
+            try:
+                now = time.time()
+                cache = {
+                    k: v for k, v in _read_cache(f).items()
+                    if now - v.get("ts", 0) < CACHE_TTL
+                }
+                cache[key] = {"decision": decision, "ts": now}
+
+                f.seek(0)
+                f.truncate()
+                f.write(hook_utils.json_dumps(cache).encode())
+                f.flush()
+            finally:
+                hook_utils.release_lock(f)
+    except OSError:
+        # The cache is an optimization only; never fail the hook over it
+        pass
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Approval Daemon
+Long-lived Grok judge for approval-hook.py, served over a Unix socket
+Keeps LangChain imported and the Grok client (and its HTTP connection pool) warm across tool calls
+
+Usage: python3 approval-daemon.py
+Run it under launchd/systemd --user; the hook falls back to judging in-process when it is not running.
+
+Protocol: one newline-terminated JSON request per connection,
+{"tool_name": ..., "tool_input": {...}, "cwd": ...}, answered with {"decision": "allow"|"deny"|"ask"}, or {"error": ...} if the request could not be judged
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+
+import grok_judge
+
+
+# Longest request line accepted; Write/Edit payloads easily exceed asyncio's 64 KiB default
+REQUEST_LIMIT = 32 * 1024 * 1024
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Judge a single request and write back the decision"""
+    response = {}
+    try:
+        request = json.loads(await reader.readline())
+        # The LangChain client is synchronous; keep the event loop free for other hooks
+        decision = await asyncio.get_running_loop().run_in_executor(
+            None,
+            grok_judge.judge_with_grok,
+            request.get("tool_name"),
+            request.get("tool_input", {}),
+            request.get("cwd", ""),
+        )
+        response = {"decision": decision}
+    except Exception as e:
+        # Report the failure rather than a verdict, so the hook can judge in-process instead
+        print(f"Error handling approval request: {e}", file=sys.stderr)
+        response = {"error": str(e)}
+
+    try:
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve() -> None:
+    """Listen on grok_judge.SOCKET_PATH until cancelled"""
+    socket_path = grok_judge.SOCKET_PATH
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+
+    # Remove a stale socket left by a previous run
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = await asyncio.start_unix_server(
+        handle_connection, path=socket_path, limit=REQUEST_LIMIT
+    )
+    os.chmod(socket_path, 0o600)
+
+    # Stop cleanly (and remove the socket) when the service manager sends SIGTERM
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def main():
+    """Main daemon execution"""
+    # Pay the LangChain import and client construction once, up front
+    try:
+        grok_judge._get_client()
+    except Exception as e:
+        print(f"Error preloading Grok client: {e}", file=sys.stderr)
+
+    try:
+        asyncio.run(serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
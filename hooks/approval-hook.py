@@ -4,21 +4,56 @@ Approval Hook (PreToolUse)
 Uses Grok-4-Fast to judge whether tool operations should be auto-approved, denied, or require user confirmation
 """
 
-import json
+import re
+import socket
 import sys
 import os
-from pathlib import Path
+from typing import Optional
 
-# Add paths for imports
-sys.path.insert(0, "/Users/max/local/opcode/utils")
-sys.path.insert(0, str(Path(__file__).parent))
+import hook_utils
+import session_settings
+import grok_judge
 
-# Load .env from opcode directory
-from dotenv import load_dotenv
-load_dotenv("/Users/max/local/opcode/.env")
+# Seconds to wait for a verdict from approval-daemon.py before defaulting to ask
+DAEMON_TIMEOUT = 30
 
-from llm_utils import LangChainLLMClient, LangChainLLMConfig, build_messages
-import session_settings
+# Read-only tools, always allowed
+READONLY_TOOLS = frozenset({"Read", "Grep", "Glob"})
+
+# Core Claude Code tools, always allowed
+CORE_CLAUDE_TOOLS = frozenset({"TodoWrite", "Task", "Skill", "SlashCommand", "AskUserQuestion", "ExitPlanMode"})
+
+# Tools whose writes are allowed when targeting a temporary directory
+WRITE_TOOLS = frozenset({"Write", "Edit"})
+
+# Temporary directory prefixes, as a tuple so str.startswith checks them all in one call
+SAFE_TEMP_DIRS = ("/tmp/", "/var/tmp/", "/private/tmp/")
+
+# Read-only Bash commands allowed without asking Grok; the whole single-line command must
+# match, and shell metacharacters (chaining, pipes, redirects, substitution) are rejected
+SAFE_BASH = re.compile(
+    r"^[ \t]*(ls|pwd|cat|echo|which|type|head|tail|wc|git[ \t]+(status|log|diff)|find[ \t]+\S+[ \t]+-type[ \t]+f)"
+    r"([ \t]+[^;&|<>`$()\r\n\\]*)?$"
+)
+
+# Options that make an otherwise read-only SAFE_BASH command write files or run commands
+SAFE_BASH_EXCLUDED = re.compile(r"--output\b|--ext-diff\b|\s-(delete|exec|execdir|ok|okdir|fprint\w*|fls)\b")
+
+# Start of a command: line start or after a separator/subshell, optionally under sudo
+_COMMAND_START = r"(?:^|[;&|(]|\$\()\s*(?:sudo\s+)?"
+
+# Destructive Bash commands denied without asking Grok; each must sit in command position,
+# so mere mentions (grep "DROP TABLE", git log -S mkfs) are left for Grok to judge
+DANGER_BASH = re.compile(
+    _COMMAND_START + r"(?:"
+    r"rm\s+(-\S+\s+)*-[a-zA-Z]*[rR][a-zA-Z]*\s+(-\S+\s+)*(/|/\*|~/?|\$HOME/?|\*)(\s|[;&|)]|$)"
+    r"|:\(\)\s*\{\s*:\s*\|\s*:\s*&\s*\}\s*;\s*:"
+    r"|(psql|mysql|mariadb|sqlite3)\b[^;&|]*\bDROP\s+(TABLE|DATABASE)\b"
+    r"|mkfs(\.\w+)?\b"
+    r"|dd\s+[^;&|]*\bof=/dev/"
+    r")",
+    re.IGNORECASE | re.MULTILINE,
+)
 
 
 def is_safe_operation(tool_name: str, tool_input: dict, cwd: str) -> tuple[bool, str]:
@@ -33,99 +68,106 @@ def is_safe_operation(tool_name: str, tool_input: dict, cwd: str) -> tuple[bool,
     Returns:
         Tuple of (is_safe, reason)
     """
-    # Always allow Read operations (read-only)
-    if tool_name == "Read":
-        return (True, "Read operation - safe (read-only)")
-
-    # Always allow Grep operations (read-only)
-    if tool_name == "Grep":
-        return (True, "Grep operation - safe (read-only)")
-
-    # Always allow Glob operations (read-only)
-    if tool_name == "Glob":
-        return (True, "Glob operation - safe (read-only)")
+    # Always allow Read, Grep and Glob operations (read-only)
+    if tool_name in READONLY_TOOLS:
+        return (True, f"{tool_name} operation - safe (read-only)")
 
     # Always allow core Claude Code tools
-    core_claude_tools = ["TodoWrite", "Task", "Skill", "SlashCommand", "AskUserQuestion", "ExitPlanMode"]
-    if tool_name in core_claude_tools:
+    if tool_name in CORE_CLAUDE_TOOLS:
         return (True, f"{tool_name} - core Claude Code tool (safe)")
 
-    # Check for safe temporary directory writes
-    if tool_name in ["Write", "Edit"]:
+    # Allow writes to /tmp, /var/tmp, and user's temp directories
+    if tool_name in WRITE_TOOLS:
         file_path = tool_input.get("file_path", "")
-
-        # Allow writes to /tmp, /var/tmp, and user's temp directories
-        safe_temp_dirs = ["/tmp/", "/var/tmp/", "/private/tmp/"]
-
-        if any(file_path.startswith(temp_dir) for temp_dir in safe_temp_dirs):
+        if file_path.startswith(SAFE_TEMP_DIRS):
             return (True, f"Write to temporary directory - safe ({file_path})")
 
     # Not a recognized safe operation
     return (False, "Operation requires review")
 
 
-def judge_with_grok(tool_name: str, tool_input: dict, cwd: str) -> str:
+def classify_bash(command: str) -> Optional[tuple[str, str]]:
     """
-    Use Grok-4-Fast to judge the safety of a tool operation
+    Decide obviously safe or obviously destructive Bash commands locally
 
     Args:
-        tool_name: Name of the tool being called
-        tool_input: Input parameters for the tool
-        cwd: Current working directory
+        command: The Bash command line
 
     Returns:
-        One of: "allow", "deny", "ask"
+        Tuple of (decision, reason), or None if Grok should judge the command
+
+    >>> classify_bash("git status")
+    ('allow', 'Read-only Bash command - safe')
+    >>> classify_bash("ls\\nrm -rf ./src") is None
+    True
+    >>> classify_bash("git status\\ngit push --force") is None
+    True
+    >>> classify_bash("ls\\r\\nrm -rf ./src") is None
+    True
     """
-    try:
-        config = LangChainLLMConfig(
-            model="grok-4-fast",
-            temperature=0.1,
-            max_tokens=50
-        )
-
-        client = LangChainLLMClient(config)
-
-        # Build judgment prompt
-        prompt = f"""You are a security advisor evaluating tool use in a coding assistant.
-
-Tool: {tool_name}
-Input: {json.dumps(tool_input, indent=2)}
-Working Directory: {cwd}
+    if DANGER_BASH.search(command):
+        return ("deny", "Destructive Bash command - blocked")
+    # A newline starts another command, which SAFE_BASH would not have vetted
+    if "\n" in command or "\r" in command:
+        return None
+    if SAFE_BASH.match(command) and not SAFE_BASH_EXCLUDED.search(command):
+        return ("allow", "Read-only Bash command - safe")
+    return None
 
-Evaluate this operation and respond with ONE word only:
-- ALLOW: Safe operation, auto-approve (e.g., read-only operations, safe commands)
-- DENY: Dangerous/destructive, block it (e.g., rm -rf, DROP TABLE, deleting critical files)
-- ASK: Unclear risk, let user decide (e.g., modifying sensitive files, complex operations)
 
-Consider:
-- Is this read-only? → ALLOW
-- Is this destructive or irreversible? → DENY or ASK
-- Does it modify critical files (.env, .git/, credentials)? → ASK
-- Is the risk low and context clear? → ALLOW
-
-Response (ONE WORD ONLY):"""
-
-        messages = build_messages(None, prompt)
-        response = client.chat(messages).strip().upper()
+def ask_daemon(tool_name: str, tool_input: dict, cwd: str) -> Optional[tuple[str, Optional[str]]]:
+    """
+    Ask the long-lived approval daemon for a verdict
 
-        # Validate response
-        if response in ["ALLOW", "DENY", "ASK"]:
-            return response.lower()
+    Only a missing or refused socket, or an explicit error from the daemon, falls
+    back to judging in-process; once the daemon has the request, a timeout or
+    broken connection means "ask" so a slow Grok call is never paid twice.
 
-        # If unexpected response, default to safe
-        return "ask"
+    Args:
+        tool_name: Name of the tool being called
+        tool_input: Input parameters for the tool
+        cwd: Current working directory
 
-    except Exception as e:
-        print(f"Error calling Grok: {e}", file=sys.stderr)
-        # On error, default to asking user
-        return "ask"
+    Returns:
+        Tuple of (decision, reason), where reason is None for a Grok verdict,
+        or None if the hook should judge in-process
+    """
+    if not os.path.exists(grok_judge.SOCKET_PATH):
+        return None
+
+    request = {"tool_name": tool_name, "tool_input": tool_input, "cwd": cwd}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(DAEMON_TIMEOUT)
+        try:
+            sock.connect(grok_judge.SOCKET_PATH)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            print(f"Approval daemon unavailable: {e}", file=sys.stderr)
+            return None
+
+        try:
+            sock.sendall(hook_utils.json_dumps(request).encode() + b"\n")
+            with sock.makefile('rb') as f:
+                response = hook_utils.json_loads(f.readline())
+        except socket.timeout:
+            return ("ask", f"Approval daemon did not answer within {DAEMON_TIMEOUT}s - defaulting to ask")
+        except (OSError, ValueError) as e:
+            return ("ask", f"Approval daemon failed: {e} - defaulting to ask")
+
+    if "error" in response:
+        print(f"Approval daemon error: {response['error']}", file=sys.stderr)
+        return None
+
+    decision = response.get("decision")
+    if decision not in ("allow", "deny", "ask"):
+        return ("ask", f"Approval daemon returned an invalid decision {decision!r} - defaulting to ask")
+    return (decision, None)
 
 
 def main():
     """Main hook execution"""
     try:
         # Read hook input
-        input_data = json.load(sys.stdin)
+        input_data = hook_utils.read_hook_input()
 
         session_id = input_data.get("session_id")
         tool_name = input_data.get("tool_name")
@@ -148,7 +190,7 @@ def main():
                     "permissionDecisionReason": "Strict mode: Manual approval required for all operations"
                 }
             }
-            print(json.dumps(output))
+            hook_utils.write_hook_output(output)
             sys.exit(0)
 
         # Auto mode - auto-approve everything (bypass permissions)
@@ -160,7 +202,7 @@ def main():
                     "permissionDecisionReason": "Auto mode: Bypassing all permission checks"
                 }
             }
-            print(json.dumps(output))
+            hook_utils.write_hook_output(output)
             sys.exit(0)
 
         # AI mode - use Grok to judge
@@ -176,11 +218,30 @@ def main():
                         "permissionDecisionReason": f"AI mode: {reason} (bypassing Grok)"
                     }
                 }
-                print(json.dumps(output))
+                hook_utils.write_hook_output(output)
                 sys.exit(0)
 
+            # Obviously safe or destructive shell commands are decided locally (no API call needed)
+            if tool_name == "Bash":
+                local = classify_bash(str(tool_input.get("command", "")))
+                if local:
+                    decision, reason = local
+                    output = {
+                        "hookSpecificOutput": {
+                            "hookEventName": "PreToolUse",
+                            "permissionDecision": decision,
+                            "permissionDecisionReason": f"AI mode: {reason} (bypassing Grok)"
+                        }
+                    }
+                    hook_utils.write_hook_output(output)
+                    sys.exit(0)
+
             # Not a known safe operation, use Grok to judge
-            decision = judge_with_grok(tool_name, tool_input, cwd)
+            # (via the warm daemon if running, otherwise in this process)
+            verdict = ask_daemon(tool_name, tool_input, cwd)
+            if verdict is None:
+                verdict = (grok_judge.judge_with_grok(tool_name, tool_input, cwd), None)
+            decision, reason = verdict
 
             reasons = {
                 "allow": f"Grok judged this {tool_name} operation as safe - auto-approved",
@@ -192,10 +253,10 @@ def main():
                 "hookSpecificOutput": {
                     "hookEventName": "PreToolUse",
                     "permissionDecision": decision,
-                    "permissionDecisionReason": reasons.get(decision, "Unknown")
+                    "permissionDecisionReason": reason or reasons.get(decision, "Unknown")
                 }
             }
-            print(json.dumps(output))
+            hook_utils.write_hook_output(output)
             sys.exit(0)
 
         # Unknown mode - default to asking
@@ -206,7 +267,7 @@ def main():
                 "permissionDecisionReason": f"Unknown approval mode '{approval_mode}' - defaulting to ask"
             }
         }
-        print(json.dumps(output))
+        hook_utils.write_hook_output(output)
         sys.exit(0)
 
     except Exception as e:
@@ -219,7 +280,7 @@ def main():
                 "permissionDecisionReason": f"Hook error: {str(e)} - defaulting to ask"
             }
         }
-        print(json.dumps(output))
+        hook_utils.write_hook_output(output)
         sys.exit(0)
 
 
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Dump tracked sessions for inspection
+Usage: python3 dump_sessions.py [--pretty]
+Prints the tracked sessions from the global database, compact unless --pretty is given
+"""
+
+import sys
+
+import hook_utils
+
+def main():
+    pretty = "--pretty" in sys.argv[1:]
+    print(hook_utils.json_dumps(hook_utils.read_sessions(), indent=pretty))
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,12 @@ Usage: python3 get_current_session_id.py [cwd]
 If no CWD provided, uses $PWD from environment
 """
 
-import json
 import sys
 import os
 from pathlib import Path
 
+import hook_utils
+
 def get_current_session_id(cwd=None):
     """Find session ID by matching current working directory"""
     if cwd is None:
@@ -18,29 +19,17 @@ def get_current_session_id(cwd=None):
     # Normalize the CWD path
     cwd = str(Path(cwd).resolve())
 
-    # Read the sessions file
-    sessions_file = Path.home() / "local" / "global" / "claude-sessions.json"
-
-    if not sessions_file.exists():
-        print("ERROR: Sessions file not found", file=sys.stderr)
+    if not os.path.exists(hook_utils.DB_FILE) and not os.path.exists(hook_utils.SESSIONS_FILE):
+        print("ERROR: Sessions database not found", file=sys.stderr)
         return None
 
-    with open(sessions_file, 'r') as f:
-        data = json.load(f)
-
-    sessions = data.get("sessions", [])
-
-    # Find most recent session matching the CWD
-    matching_sessions = [s for s in sessions if s.get("cwd") == cwd]
-
-    if not matching_sessions:
+    # Indexed lookup of the most recently active session in this CWD
+    session_id = hook_utils.latest_session_id(cwd)
+    if not session_id:
         print(f"ERROR: No session found for CWD: {cwd}", file=sys.stderr)
         return None
 
-    # Sort by last_activity (most recent first)
-    matching_sessions.sort(key=lambda s: s.get("last_activity", 0), reverse=True)
-
-    return matching_sessions[0]["session_id"]
+    return session_id
 
 if __name__ == "__main__":
     cwd = sys.argv[1] if len(sys.argv) > 1 else None
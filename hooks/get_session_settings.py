@@ -6,10 +6,7 @@ Usage: python3 get_session_settings.py <session_id>
 
 import sys
 import json
-from pathlib import Path
 
-# Add to path
-sys.path.insert(0, str(Path(__file__).parent))
 import session_settings
 
 def main():
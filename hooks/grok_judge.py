@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Grok Judge
+Asks Grok-4-Fast whether a tool operation should be allowed, denied, or left to the user
+Shared by approval-hook.py (in-process fallback) and approval-daemon.py
+"""
+
+import functools
+import json
+import os
+import sys
+
+import _verdict_cache
+
+
+# Root of the opcode checkout (parent of hooks/), home of utils/llm_utils.py and .env
+OPCODE_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# Unix socket served by approval-daemon.py
+SOCKET_PATH = os.path.expanduser("~/.opcode/approval.sock")
+
+# Longest bulk payload value from tool_input embedded in the Grok prompt
+PROMPT_VALUE_MAX_CHARS = 400
+
+# tool_input fields holding bulk file content, the only ones shortened for the prompt;
+# commands, paths, URLs and patterns drive the verdict and are always sent in full
+TRUNCATED_FIELDS = frozenset({"content", "old_string", "new_string", "edits"})
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client():
+    """
+    Build the Grok client on first use
+
+    LangChain and dotenv are imported here rather than at module load so that
+    non-AI modes and smart-rule decisions never pay their import cost.
+    """
+    sys.path.insert(0, os.path.join(OPCODE_DIR, "utils"))
+
+    # Load .env from opcode directory
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(OPCODE_DIR, ".env"))
+
+    from llm_utils import LangChainLLMConfig, create_client
+
+    config = LangChainLLMConfig(
+        model="grok-4-fast",
+        temperature=0.1,
+        max_tokens=50
+    )
+    return create_client(config)
+
+
+def _shorten(obj, maxlen: int):
+    """Recursively shorten string values longer than maxlen"""
+    if isinstance(obj, str):
+        if len(obj) > maxlen:
+            return obj[:maxlen] + f"…<+{len(obj) - maxlen} chars truncated>"
+        return obj
+    if isinstance(obj, dict):
+        return {k: _shorten(v, maxlen) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_shorten(v, maxlen) for v in obj]
+    return obj
+
+
+def _truncate(tool_input, maxlen: int = PROMPT_VALUE_MAX_CHARS):
+    """Shorten the bulk payload fields of tool_input (TRUNCATED_FIELDS), leaving every other field intact"""
+    if not isinstance(tool_input, dict):
+        return tool_input
+    return {
+        k: _shorten(v, maxlen) if k in TRUNCATED_FIELDS else v
+        for k, v in tool_input.items()
+    }
+
+
+def judge_with_grok(tool_name: str, tool_input: dict, cwd: str) -> str:
+    """
+    Use Grok-4-Fast to judge the safety of a tool operation
+
+    Args:
+        tool_name: Name of the tool being called
+        tool_input: Input parameters for the tool
+        cwd: Current working directory
+
+    Returns:
+        One of: "allow", "deny", "ask"
+    """
+    # Serve repeated operations from the verdict cache (no API call needed)
+    cacheable = _verdict_cache.is_cacheable(tool_name, tool_input)
+    if cacheable:
+        cache_key = _verdict_cache.make_key(tool_name, tool_input, cwd)
+        cached = _verdict_cache.get_verdict(cache_key)
+        if cached:
+            return cached
+
+    try:
+        client = _get_client()
+        from llm_utils import build_messages
+
+        # Build judgment prompt
+        prompt = f"""You are a security advisor evaluating tool use in a coding assistant.
+
+Tool: {tool_name}
+Input: {json.dumps(_truncate(tool_input), ensure_ascii=False, separators=(",", ":"))}
+Working Directory: {cwd}
+
+Evaluate this operation and respond with ONE word only:
+- ALLOW: Safe operation, auto-approve (e.g., read-only operations, safe commands)
+- DENY: Dangerous/destructive, block it (e.g., rm -rf, DROP TABLE, deleting critical files)
+- ASK: Unclear risk, let user decide (e.g., modifying sensitive files, complex operations)
+
+Consider:
+- Is this read-only? → ALLOW
+- Is this destructive or irreversible? → DENY or ASK
+- Does it modify critical files (.env, .git/, credentials)? → ASK
+- Is the risk low and context clear? → ALLOW
+
+Response (ONE WORD ONLY):"""
+
+        messages = build_messages(None, prompt)
+        response = client.chat(messages).strip().upper()
+
+        # Validate response
+        if response in ["ALLOW", "DENY", "ASK"]:
+            decision = response.lower()
+            if cacheable:
+                _verdict_cache.put_verdict(cache_key, decision)
+            return decision
+
+        # If unexpected response, default to safe
+        return "ask"
+
+    except Exception as e:
+        print(f"Error calling Grok: {e}", file=sys.stderr)
+        # On error, default to asking user
+        return "ask"
@@ -1,124 +1,300 @@
 #!/usr/bin/env python3
 """
 Shared utility functions for Claude Code hooks
-Handles reading/writing to the global sessions JSON file with basic file locking
+Handles reading/writing tracked sessions in the global SQLite database
 """
 
 import json
 import os
 import fcntl
+import sqlite3
+import sys
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, Optional
 
-# Global data file location
+try:  # Optional dependency, several times faster than the stdlib json module
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Global database holding tracked sessions and per-session settings
+DB_FILE = os.path.expanduser("~/local/global/claude.db")
+
+# Columns of the sessions table, in schema order
+SESSION_COLUMNS = (
+    "session_id", "cwd", "transcript_path", "permission_mode",
+    "status", "started_at", "last_activity", "last_notification",
+)
+
+# touch_session skips the write if the session was marked running more recently than this (seconds)
+TOUCH_MIN_INTERVAL = 1.0
+
+# Seconds a writer waits for another process's transaction before giving up
+DB_TIMEOUT = 10
+
+# Legacy JSON storage, migrated into DB_FILE once and then renamed with MIGRATED_SUFFIX
 SESSIONS_FILE = os.path.expanduser("~/local/global/claude-sessions.json")
+EVENTS_FILE = os.path.expanduser("~/local/global/claude-sessions.events.jsonl")
+SETTINGS_DIR = os.path.expanduser("~/local/global/session-settings")
+MIGRATED_SUFFIX = ".migrated"
 
-def acquire_lock(file_handle, timeout=5):
-    """Acquire an exclusive lock on the file with timeout"""
-    start_time = time.time()
-    while True:
-        try:
-            fcntl.flock(file_handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
-            return True
-        except IOError:
-            if time.time() - start_time > timeout:
-                return False
-            time.sleep(0.1)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    cwd TEXT NOT NULL DEFAULT '',
+    transcript_path TEXT NOT NULL DEFAULT '',
+    permission_mode TEXT NOT NULL DEFAULT 'default',
+    status TEXT NOT NULL DEFAULT 'running',
+    started_at REAL NOT NULL DEFAULT 0,
+    last_activity REAL NOT NULL DEFAULT 0,
+    last_notification TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_cwd_activity ON sessions (cwd, last_activity DESC);
+CREATE TABLE IF NOT EXISTS session_settings (
+    session_id TEXT PRIMARY KEY,
+    json_blob TEXT NOT NULL,
+    updated_at TEXT
+);
+"""
+
+# Per-process connection, opened lazily by connect()
+_conn: Optional[sqlite3.Connection] = None
+
+def json_loads(data):
+    """Parse JSON from str or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(data: Any, indent: bool = False) -> str:
+    """Serialize data to a JSON string (compact unless indent), using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    if indent:
+        return json.dumps(data, indent=2)
+    return json.dumps(data, separators=(",", ":"))
+
+def read_hook_input() -> Dict[str, Any]:
+    """Parse the hook event JSON from stdin, reading bytes to skip text decoding"""
+    return json_loads(sys.stdin.buffer.read())
+
+def write_hook_output(output: Dict[str, Any]) -> None:
+    """Write a hook decision to stdout as JSON"""
+    print(json_dumps(output), flush=True)
+
+def acquire_lock(file_handle):
+    """Acquire an exclusive lock on the file, blocking until it is available"""
+    fcntl.flock(file_handle, fcntl.LOCK_EX)
 
 def release_lock(file_handle):
     """Release the lock on the file"""
     fcntl.flock(file_handle, fcntl.LOCK_UN)
 
-def read_sessions() -> Dict[str, Any]:
+def connect() -> sqlite3.Connection:
     """
-    Read sessions from the global JSON file
-    Returns empty structure if file doesn't exist
+    Open the global database once per process, creating the schema and
+    migrating legacy JSON storage on first use
+    Statements autocommit; use transaction() to group a read-modify-write
     """
-    if not os.path.exists(SESSIONS_FILE):
-        return {"sessions": [], "last_updated": None}
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+        conn = sqlite3.connect(DB_FILE, timeout=DB_TIMEOUT, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers (including the GUI) proceed while a hook writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _migrate_legacy_json(conn)
+        _conn = conn
+    return _conn
 
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run the body in a write transaction, rolling back if it raises"""
+    conn.execute("BEGIN IMMEDIATE")
     try:
-        with open(SESSIONS_FILE, 'r') as f:
-            acquire_lock(f)
-            try:
-                data = json.load(f)
-                return data
-            finally:
-                release_lock(f)
-    except (json.JSONDecodeError, IOError):
-        # If file is corrupted or can't be read, return empty structure
-        return {"sessions": [], "last_updated": None}
-
-def write_sessions(data: Dict[str, Any]) -> bool:
-    """
-    Write sessions to the global JSON file with file locking
-    Returns True on success, False on failure
-    """
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def _read_legacy_sessions() -> Dict[str, Dict[str, Any]]:
+    """Read sessions from the legacy JSON snapshot with its event log replayed on top"""
+    sessions: Dict[str, Dict[str, Any]] = {}
     try:
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(SESSIONS_FILE), exist_ok=True)
+        with open(SESSIONS_FILE, 'rb') as f:
+            stored = json_loads(f.read()).get("sessions", {})
+        # Snapshots written before sessions were keyed by ID store a list
+        if isinstance(stored, list):
+            stored = {s.get("session_id"): s for s in stored if isinstance(s, dict)}
+        sessions.update(stored)
+    except (ValueError, AttributeError, IOError):
+        pass
 
-        # Write with atomic rename
-        temp_file = SESSIONS_FILE + ".tmp"
-        with open(temp_file, 'w') as f:
-            acquire_lock(f)
-            try:
-                json.dump(data, f, indent=2)
-                f.flush()
-                os.fsync(f.fileno())
-            finally:
-                release_lock(f)
-
-        # Atomic rename
-        os.rename(temp_file, SESSIONS_FILE)
-        return True
-    except Exception as e:
-        print(f"Error writing sessions: {e}", flush=True)
-        return False
+    try:
+        with open(EVENTS_FILE, 'rb') as f:
+            lines = f.readlines()
+    except IOError:
+        lines = []
+    for line in lines:
+        try:
+            event = json_loads(line)
+        except ValueError:
+            # Partially written trailing line
+            continue
+        if not isinstance(event, dict):
+            continue
+        op = event.get("op")
+        if op == "add":
+            session = event.get("session")
+            if isinstance(session, dict):
+                sessions[session.get("session_id")] = session
+        elif op == "remove":
+            sessions.pop(event.get("session_id"), None)
+        elif op == "update":
+            session = sessions.get(event.get("session_id"))
+            updates = event.get("updates")
+            if isinstance(session, dict) and isinstance(updates, dict):
+                session.update(updates)
+    return sessions
 
-def add_session(session_data: Dict[str, Any]) -> bool:
-    """
-    Add a new session to the tracking file
-    """
-    data = read_sessions()
+def _migrate_legacy_json(conn: sqlite3.Connection) -> None:
+    """Import sessions and settings from the legacy JSON files once, then rename them aside"""
+    legacy = [p for p in (SESSIONS_FILE, EVENTS_FILE, SETTINGS_DIR) if os.path.exists(p)]
+    if not legacy:
+        return
 
-    # Check if session already exists
-    session_id = session_data.get("session_id")
-    existing_sessions = [s for s in data["sessions"] if s.get("session_id") != session_id]
+    with transaction(conn):
+        # Another process may have finished the migration while we waited for the write lock
+        legacy = [p for p in legacy if os.path.exists(p)]
+        if not legacy:
+            return
 
-    # Add new session
-    existing_sessions.append(session_data)
+        # Malformed legacy rows are skipped, so one bad file can't fail the migration on every run
+        for session in _read_legacy_sessions().values():
+            if not isinstance(session, dict) or not session.get("session_id"):
+                continue
+            # Null fields take their column defaults
+            session = {k: v for k, v in session.items() if v is not None}
+            try:
+                _insert_session(conn, session, "INSERT OR IGNORE")
+            except sqlite3.Error as e:
+                print(f"Skipping legacy session {session['session_id']!r}: {e}", file=sys.stderr)
+
+        try:
+            with os.scandir(SETTINGS_DIR) as it:
+                paths = [entry.path for entry in it if entry.name.endswith(".json")]
+        except OSError:
+            paths = []
+        for path in paths:
+            try:
+                with open(path, 'rb') as f:
+                    settings = json_loads(f.read())
+            except (ValueError, IOError):
+                continue
+            if not isinstance(settings, dict):
+                continue
+            updated_at = settings.get("updated_at")
+            try:
+                conn.execute(
+                    "INSERT OR IGNORE INTO session_settings (session_id, json_blob, updated_at) VALUES (?, ?, ?)",
+                    (
+                        os.path.basename(path)[:-len(".json")],
+                        json_dumps(settings),
+                        updated_at if isinstance(updated_at, str) else None,
+                    ),
+                )
+            except sqlite3.Error as e:
+                print(f"Skipping legacy settings {path}: {e}", file=sys.stderr)
 
-    data["sessions"] = existing_sessions
-    data["last_updated"] = time.time()
+        for path in legacy:
+            os.replace(path, path + MIGRATED_SUFFIX)
 
-    return write_sessions(data)
+def _insert_session(conn: sqlite3.Connection, session: Dict[str, Any], verb: str = "INSERT OR REPLACE") -> None:
+    """Insert one session row; columns missing from session take their schema defaults"""
+    columns = [c for c in SESSION_COLUMNS if c in session]
+    conn.execute(
+        f"{verb} INTO sessions ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+        [session[c] for c in columns],
+    )
 
-def remove_session(session_id: str) -> bool:
+def read_sessions() -> Dict[str, Any]:
     """
-    Remove a session from the tracking file
+    Read all tracked sessions, in the order they started
+    Sessions are keyed by session_id: {"sessions": {sid: {...}}, "last_updated": ...}
     """
-    data = read_sessions()
-
-    # Filter out the session
-    data["sessions"] = [s for s in data["sessions"] if s.get("session_id") != session_id]
-    data["last_updated"] = time.time()
+    rows = connect().execute("SELECT * FROM sessions ORDER BY started_at").fetchall()
+    sessions = {row["session_id"]: dict(row) for row in rows}
+    last_updated = max((s["last_activity"] for s in sessions.values()), default=None)
+    return {"sessions": sessions, "last_updated": last_updated}
 
-    return write_sessions(data)
+def latest_session_id(cwd: str) -> Optional[str]:
+    """Return the most recently active session in cwd, or None if there is none"""
+    row = connect().execute(
+        "SELECT session_id FROM sessions WHERE cwd = ? ORDER BY last_activity DESC LIMIT 1", (cwd,)
+    ).fetchone()
+    return row["session_id"] if row else None
 
-def update_session(session_id: str, updates: Dict[str, Any]) -> bool:
+def add_session(session_data: Dict[str, Any]) -> bool:
     """
-    Update specific fields of a session
+    Add a new session to the database, replacing any with the same ID
+    Returns True on success, False on failure
     """
-    data = read_sessions()
+    try:
+        _insert_session(connect(), session_data)
+        return True
+    except sqlite3.Error as e:
+        print(f"Error adding session: {e}", flush=True)
+        return False
 
-    # Find and update the session
-    for session in data["sessions"]:
-        if session.get("session_id") == session_id:
-            session.update(updates)
-            break
+def remove_session(session_id: str) -> bool:
+    """
+    Remove a session from the database
+    Returns True on success, False on failure
+    """
+    try:
+        connect().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        return True
+    except sqlite3.Error as e:
+        print(f"Error removing session: {e}", flush=True)
+        return False
 
-    data["last_updated"] = time.time()
+def update_session(session_id: str, updates: Dict[str, Any]) -> bool:
+    """
+    Update specific fields of a session; keys that are not session columns are ignored
+    Returns True on success, False on failure
+    """
+    columns = [c for c in SESSION_COLUMNS if c in updates and c != "session_id"]
+    if not columns:
+        return True
+    try:
+        connect().execute(
+            f"UPDATE sessions SET {', '.join(c + ' = ?' for c in columns)} WHERE session_id = ?",
+            [updates[c] for c in columns] + [session_id],
+        )
+        return True
+    except sqlite3.Error as e:
+        print(f"Error updating session: {e}", flush=True)
+        return False
 
-    return write_sessions(data)
\ No newline at end of file
+def touch_session(session_id: str) -> bool:
+    """
+    Mark a session running as of now, in one conditional UPDATE
+    Skips the write when it is already running with a last_activity under TOUCH_MIN_INTERVAL old
+    Returns True on success, False on failure
+    """
+    now = time.time()
+    try:
+        connect().execute(
+            "UPDATE sessions SET status = 'running', last_activity = ? "
+            "WHERE session_id = ? AND NOT (status = 'running' AND last_activity > ?)",
+            (now, session_id, now - TOUCH_MIN_INTERVAL),
+        )
+        return True
+    except sqlite3.Error as e:
+        print(f"Error updating session: {e}", flush=True)
+        return False
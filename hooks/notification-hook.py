@@ -4,20 +4,53 @@ Notification Hook
 Updates session status when Claude needs attention (permissions or idle)
 """
 
-import json
+import re
 import sys
 import time
-from pathlib import Path
 
-# Add hooks directory to path
-sys.path.insert(0, str(Path(__file__).parent))
 import hook_utils
 import session_settings
 
+try:  # Optional dependency
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+# (keyword, status) pairs matched against the lowercased message
+# Earlier entries take priority when several keywords match
+STATUS_KEYWORDS = (
+    ("permission", "needs_permission"),
+    ("waiting for your input", "waiting_for_input"),
+    ("idle", "waiting_for_input"),
+)
+
+# Built once at import so each message is scanned in a single pass regardless of keyword count
+if ahocorasick is not None:
+    _AUTOMATON = ahocorasick.Automaton()
+    for _priority, (_keyword, _status) in enumerate(STATUS_KEYWORDS):
+        _AUTOMATON.add_word(_keyword, _priority)
+    _AUTOMATON.make_automaton()
+else:
+    _KEYWORD_PRIORITY = {keyword: i for i, (keyword, _) in enumerate(STATUS_KEYWORDS)}
+    _KEYWORD_PATTERN = re.compile("|".join(map(re.escape, _KEYWORD_PRIORITY)))
+
+
+def match_status(message: str) -> str:
+    """Map a notification message to a session status, defaulting to running"""
+    text = message.lower()
+    if ahocorasick is not None:
+        priority = min((p for _, p in _AUTOMATON.iter(text)), default=None)
+    else:
+        priority = min((_KEYWORD_PRIORITY[m.group()] for m in _KEYWORD_PATTERN.finditer(text)), default=None)
+
+    if priority is None:
+        return "running"
+    return STATUS_KEYWORDS[priority][1]
+
 def main():
     try:
         # Read input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = hook_utils.read_hook_input()
 
         session_id = input_data.get("session_id")
         message = input_data.get("message", "")
@@ -31,11 +64,7 @@ def main():
             sys.exit(0)
 
         # Determine status based on message
-        status = "running"
-        if "permission" in message.lower():
-            status = "needs_permission"
-        elif "waiting for your input" in message.lower() or "idle" in message.lower():
-            status = "waiting_for_input"
+        status = match_status(message)
 
         # Update session status
         updates = {
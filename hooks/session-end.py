@@ -4,18 +4,14 @@ SessionEnd Hook
 Removes a Claude Code session when it ends
 """
 
-import json
 import sys
-from pathlib import Path
 
-# Add hooks directory to path
-sys.path.insert(0, str(Path(__file__).parent))
 import hook_utils
 
 def main():
     try:
         # Read input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = hook_utils.read_hook_input()
 
         session_id = input_data.get("session_id")
         if not session_id:
@@ -4,28 +4,26 @@ SessionStart Hook
 Registers a new Claude Code session when it starts
 """
 
-import json
 import sys
 import time
-from pathlib import Path
 
-# Add hooks directory to path
-sys.path.insert(0, str(Path(__file__).parent))
 import hook_utils
 import session_settings
 
 def main():
     try:
         # Read input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = hook_utils.read_hook_input()
 
         session_id = input_data.get("session_id")
         if not session_id:
             # No session ID available yet, skip
             sys.exit(0)
 
-        # Initialize session settings (creates default settings if not exists)
-        session_settings.load_settings(session_id)
+        # Initialize session settings in a single read-modify-write
+        # (creates defaults if not exists, stamps updated_at on save)
+        with session_settings.mutate_settings(session_id) as settings:
+            settings.setdefault("metadata", {}).setdefault("approval_mode", "ai")
 
         # Create session data
         session_data = {
@@ -4,27 +4,33 @@ Session Settings Manager
 Provides per-session configuration for hooks and metadata
 """
 
+import copy
 import json
-import os
-from pathlib import Path
-from typing import Dict, Any, Optional
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Dict, Any, Iterator, Tuple
 
+import hook_utils
 
-SETTINGS_DIR = Path.home() / "local" / "global" / "session-settings"
 
+# Per-process cache of parsed settings: session_id -> (PRAGMA data_version, settings)
+# data_version changes whenever another connection commits, invalidating every entry
+_settings_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
 
-def get_settings_path(session_id: str) -> Path:
-    """
-    Get the path to the settings file for a session
+# Last formatted second for _now_iso
+_last_second = None
+_last_iso = ""
 
-    Args:
-        session_id: The Claude session ID
 
-    Returns:
-        Path to the settings JSON file
-    """
-    return SETTINGS_DIR / f"{session_id}.json"
+def _now_iso() -> str:
+    """Current UTC time as ISO 8601 with second precision, formatted at most once per second"""
+    global _last_second, _last_iso
+    second = int(time.time())
+    if second != _last_second:
+        _last_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+        _last_second = second
+    return _last_iso
 
 
 def get_default_settings(session_id: str) -> Dict[str, Any]:
@@ -39,7 +45,8 @@ def get_default_settings(session_id: str) -> Dict[str, Any]:
     """
     return {
         "session_id": session_id,
-        "created_at": datetime.utcnow().isoformat() + "Z",
+        "created_at": _now_iso(),
+        "created_at_ts": time.time(),
         "hooks_enabled": {
             "stop-hook": True,
             "notification-hook": True,
@@ -52,12 +59,20 @@ def get_default_settings(session_id: str) -> Dict[str, Any]:
     }
 
 
-def load_settings(session_id: str) -> Dict[str, Any]:
+def load_settings(session_id: str, mutable: bool = False) -> Dict[str, Any]:
     """
-    Load settings for a session, creating defaults if not found
+    Load settings for a session, returning defaults if not found
+
+    Defaults are not written to the database here; the first save_settings
+    call (e.g. from mutate_settings) creates the row.
+
+    Parsed settings are cached per process and reused until another
+    process commits to the database.
 
     Args:
         session_id: The Claude session ID
+        mutable: True if the caller will modify the result; otherwise the
+            shared cached dictionary is returned and must not be modified
 
     Returns:
         Settings dictionary
@@ -65,24 +80,24 @@ def load_settings(session_id: str) -> Dict[str, Any]:
     if not session_id:
         return get_default_settings("unknown")
 
-    settings_path = get_settings_path(session_id)
-
-    # Ensure directory exists
-    SETTINGS_DIR.mkdir(parents=True, exist_ok=True)
-
-    # Load existing settings or create defaults
-    if settings_path.exists():
+    conn = hook_utils.connect()
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    cached = _settings_cache.get(session_id)
+    if cached and cached[0] == data_version:
+        settings = cached[1]
+    else:
+        row = conn.execute(
+            "SELECT json_blob FROM session_settings WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return get_default_settings(session_id)
         try:
-            with open(settings_path, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            # If file is corrupted, return defaults
+            settings = hook_utils.json_loads(row["json_blob"])
+        except ValueError:
+            # If the stored blob is corrupted, return defaults
             return get_default_settings(session_id)
-    else:
-        # Create and save default settings
-        default_settings = get_default_settings(session_id)
-        save_settings(session_id, default_settings)
-        return default_settings
+        _settings_cache[session_id] = (data_version, settings)
+    return copy.deepcopy(settings) if mutable else settings
 
 
 def save_settings(session_id: str, settings: Dict[str, Any]) -> None:
@@ -96,17 +111,61 @@ def save_settings(session_id: str, settings: Dict[str, Any]) -> None:
     if not session_id:
         return
 
-    settings_path = get_settings_path(session_id)
+    # Update timestamp
+    settings["updated_at"] = _now_iso()
 
-    # Ensure directory exists
-    SETTINGS_DIR.mkdir(parents=True, exist_ok=True)
+    # The row is about to change, drop any cached copy
+    _settings_cache.pop(session_id, None)
 
-    # Update timestamp
-    settings["updated_at"] = datetime.utcnow().isoformat() + "Z"
+    hook_utils.connect().execute(
+        "INSERT OR REPLACE INTO session_settings (session_id, json_blob, updated_at) VALUES (?, ?, ?)",
+        (session_id, hook_utils.json_dumps(settings), settings["updated_at"]),
+    )
+
+
+@contextmanager
+def mutate_settings(session_id: str) -> Iterator[Dict[str, Any]]:
+    """
+    Load settings once, let the caller modify them, then save once on exit
 
-    # Save to file
-    with open(settings_path, 'w') as f:
-        json.dump(settings, f, indent=2)
+    The load and save run in one write transaction, so concurrent hooks
+    cannot lose each other's changes. Settings are not saved if the body raises.
+
+    Args:
+        session_id: The Claude session ID
+
+    Yields:
+        Settings dictionary to modify in place
+    """
+    with hook_utils.transaction(hook_utils.connect()):
+        settings = load_settings(session_id, mutable=True)
+        yield settings
+        save_settings(session_id, settings)
+
+
+def update_bulk(session_id: str, patch: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Merge a patch into a session's settings with one load and one save
+
+    Each top-level key of the patch names a settings section (e.g.
+    "hooks_enabled", "metadata") whose entries are merged into that section.
+
+    Args:
+        session_id: The Claude session ID
+        patch: Section name -> {key: value} to set
+
+    Returns:
+        The entries that actually changed, in the same shape as the patch
+    """
+    changed: Dict[str, Dict[str, Any]] = {}
+    with mutate_settings(session_id) as settings:
+        for section, values in patch.items():
+            current = settings.setdefault(section, {})
+            for key, value in values.items():
+                if key not in current or current[key] != value:
+                    current[key] = value
+                    changed.setdefault(section, {})[key] = value
+    return changed
 
 
 def is_hook_enabled(session_id: str, hook_name: str) -> bool:
@@ -136,13 +195,8 @@ def set_hook_enabled(session_id: str, hook_name: str, enabled: bool) -> None:
         hook_name: Name of the hook
         enabled: True to enable, False to disable
     """
-    settings = load_settings(session_id)
-
-    if "hooks_enabled" not in settings:
-        settings["hooks_enabled"] = {}
-
-    settings["hooks_enabled"][hook_name] = enabled
-    save_settings(session_id, settings)
+    with mutate_settings(session_id) as settings:
+        settings.setdefault("hooks_enabled", {})[hook_name] = enabled
 
 
 def get_metadata(session_id: str, key: str, default: Any = None) -> Any:
@@ -171,13 +225,8 @@ def set_metadata(session_id: str, key: str, value: Any) -> None:
         key: Metadata key
         value: Value to set
     """
-    settings = load_settings(session_id)
-
-    if "metadata" not in settings:
-        settings["metadata"] = {}
-
-    settings["metadata"][key] = value
-    save_settings(session_id, settings)
+    with mutate_settings(session_id) as settings:
+        settings.setdefault("metadata", {})[key] = value
 
 
 def clear_settings(session_id: str) -> None:
@@ -190,16 +239,22 @@ def clear_settings(session_id: str) -> None:
     if not session_id:
         return
 
-    settings_path = get_settings_path(session_id)
-
-    if settings_path.exists():
-        settings_path.unlink()
-
-    # Recreate with defaults
+    # Replace the stored row with defaults
     default_settings = get_default_settings(session_id)
     save_settings(session_id, default_settings)
 
 
+def _created_at_ts(settings: Dict[str, Any]) -> float:
+    """Creation time as epoch seconds, parsing the ISO created_at of older settings files"""
+    ts = settings.get("created_at_ts")
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    try:
+        return datetime.fromisoformat(settings["created_at"].replace("Z", "+00:00")).timestamp()
+    except (KeyError, AttributeError, ValueError):
+        return 0.0
+
+
 def list_all_sessions() -> list[Dict[str, Any]]:
     """
     List all sessions with settings
@@ -207,19 +262,17 @@ def list_all_sessions() -> list[Dict[str, Any]]:
     Returns:
         List of settings dictionaries
     """
-    if not SETTINGS_DIR.exists():
-        return []
-
     sessions = []
-    for settings_file in SETTINGS_DIR.glob("*.json"):
+    for row in hook_utils.connect().execute("SELECT json_blob FROM session_settings"):
         try:
-            with open(settings_file, 'r') as f:
-                sessions.append(json.load(f))
-        except (json.JSONDecodeError, IOError):
+            settings = hook_utils.json_loads(row["json_blob"])
+        except ValueError:
             continue
+        settings["created_at_ts"] = _created_at_ts(settings)
+        sessions.append(settings)
 
     # Sort by creation time (newest first)
-    sessions.sort(key=lambda s: s.get("created_at", ""), reverse=True)
+    sessions.sort(key=lambda s: s["created_at_ts"], reverse=True)
     return sessions
 
 
@@ -239,8 +292,9 @@ if __name__ == "__main__":
     print(f"After disabling: {is_hook_enabled(test_session_id, 'stop-hook')}")
 
     # Test metadata
-    set_metadata(test_session_id, "project_name", "test-project")
-    set_metadata(test_session_id, "approval_mode", "strict")
+    with mutate_settings(test_session_id) as settings:
+        settings["metadata"]["project_name"] = "test-project"
+        settings["metadata"]["approval_mode"] = "strict"
     print(f"\nProject name: {get_metadata(test_session_id, 'project_name')}")
     print(f"Approval mode: {get_metadata(test_session_id, 'approval_mode')}")
 
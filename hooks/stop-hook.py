@@ -5,24 +5,218 @@ Updates session's last_activity timestamp when Claude finishes responding
 Checks for pending todos and blocks stopping if work remains
 """
 
-import json
+import hashlib
+import mmap
+import re
 import sys
-import time
 import os
-from pathlib import Path
-from typing import Optional, List, Dict, Tuple, Any
+import time
+from itertools import islice
+from typing import Optional, List, Dict, Any, Iterator
 
-# Add hooks directory to path
-sys.path.insert(0, str(Path(__file__).parent))
 import hook_utils
 import session_settings
 
 
+# Per-transcript parse state, so each Stop only parses what was appended since the last one
+CACHE_DIR = os.path.expanduser("~/.claude/.stop-hook-cache")
+
+# Cache files not written for this long belong to finished sessions and are pruned
+CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+REJECTION_MARKER = "doesn't want to proceed"
+
+# Raw substrings a transcript line must contain to be worth decoding
+TODO_WRITE_BYTES = b'"TodoWrite"'
+REJECTION_BYTES = REJECTION_MARKER.encode()
+LINE_MARKERS = (TODO_WRITE_BYTES, REJECTION_BYTES)
+
+# All markers in one pattern, so a forward scan finds the next hit of any of them in a single pass
+_MARKER_PATTERN = re.compile(b"|".join(map(re.escape, LINE_MARKERS)))
+
+# TodoWrite calls kept in the cached parse state; older history is rescanned if ever needed
+MAX_TRACKED_WRITES = 16
+
+# Bytes before the cached offset kept to detect a transcript replaced in place (same inode)
+CACHE_CHECK_BYTES = 64
+
+
+def _iter_marked_lines(mm: mmap.mmap, start: int, end: int, reverse: bool = False) -> Iterator[bytes]:
+    """
+    Yield the lines within mm[start:end] that contain one of LINE_MARKERS, first to last
+    (last to first if reverse)
+
+    Searches jump from marker to marker, so lines without one are never touched
+    or copied out of the mapping.
+    """
+    if reverse:
+        # Regex can't search backwards; track the previous hit of each marker instead,
+        # -1 once it has no more hits
+        hits = [mm.rfind(marker, start, end) for marker in LINE_MARKERS]
+        while max(hits) >= 0:
+            hit = max(hits)
+            line_start = mm.rfind(b"\n", start, hit) + 1 or start
+            line_end = mm.find(b"\n", hit, end)
+            yield mm[line_start:line_end if line_end >= 0 else end]
+            # Only markers that hit inside the line just yielded need searching again
+            hits = [mm.rfind(m, start, line_start) if h >= line_start else h for m, h in zip(LINE_MARKERS, hits)]
+    else:
+        pos = start
+        while True:
+            match = _MARKER_PATTERN.search(mm, pos, end)
+            if match is None:
+                return
+            line_start = mm.rfind(b"\n", pos, match.start()) + 1 or pos
+            line_end = mm.find(b"\n", match.end(), end)
+            if line_end < 0:
+                line_end = end
+            yield mm[line_start:line_end]
+            pos = line_end
+
+
+def _is_rejection(item: Dict[str, Any]) -> bool:
+    """Check if a tool_result item indicates the user rejected the call"""
+    error = item.get("content")
+    return bool(error and REJECTION_MARKER in str(error) and item.get("tool_use_id"))
+
+
+def _find_latest_todo_write(mm: mmap.mmap) -> Optional[List[Any]]:
+    """
+    Find the latest non-rejected TodoWrite call in the mapped transcript
+
+    Returns:
+        [tool_id, todos] of the call, or None if there is none
+    """
+    rejected_tool_ids = set()
+
+    # Scan back from EOF: a call's rejection always comes after the call, so it
+    # has been seen by the time the call is reached and the first match is final
+    for line in _iter_marked_lines(mm, 0, len(mm), reverse=True):
+        try:
+            entry = hook_utils.json_loads(line)
+        except ValueError:
+            continue
+
+        message = entry.get("message", {})
+        content = message.get("content", [])
+
+        # Content items are dicts with a "type" when well-formed; anything else
+        # fails the bracket access and is skipped
+        for item in content:
+            try:
+                if item["type"] == "tool_result" and _is_rejection(item):
+                    rejected_tool_ids.add(item["tool_use_id"])
+            except (TypeError, KeyError):
+                continue
+
+        for item in reversed(content):
+            try:
+                if item["type"] != "tool_use" or item["name"] != "TodoWrite":
+                    continue
+                extracted = item["input"].get("todos")
+            except (TypeError, KeyError, AttributeError):
+                continue
+            # Only use this TodoWrite if it wasn't rejected
+            if extracted is not None and item.get("id") not in rejected_tool_ids:  # Allow empty lists
+                return [item.get("id"), extracted]
+
+    return None
+
+
+def _apply_entry(entry: Dict[str, Any], writes: List[List[Any]]) -> bool:
+    """
+    Fold one transcript entry into writes, the [tool_id, todos] of TodoWrite calls
+    that may still be the latest non-rejected one, oldest first
+
+    Returns:
+        False if a rejection removed the last known call, so older history is needed
+    """
+    message = entry.get("message", {})
+    content = message.get("content", [])
+
+    for item in content:
+        # Content items are dicts with a "type" when well-formed; anything else is skipped
+        try:
+            item_type = item["type"]
+        except (TypeError, KeyError):
+            continue
+        if item_type == "tool_use":
+            try:
+                if item["name"] != "TodoWrite":
+                    continue
+                extracted = item["input"].get("todos")
+            except (KeyError, AttributeError):
+                continue
+            if extracted is not None:  # Allow empty lists
+                writes.append([item.get("id"), extracted])
+                del writes[:-MAX_TRACKED_WRITES]
+        elif item_type == "tool_result":
+            tool_use_id = item.get("tool_use_id")
+            if not tool_use_id:
+                continue
+            index = next((i for i, w in enumerate(writes) if w[0] == tool_use_id), None)
+            if index is None:
+                continue
+            if _is_rejection(item):
+                del writes[index]
+                if not writes:
+                    return False
+            else:
+                # Accepted calls are never rejected later, so older ones can't become the latest again
+                del writes[:index]
+    return True
+
+
+def _parse_appended(mm: mmap.mmap, offset: int, check: bytes, writes: List[List[Any]]) -> Optional[int]:
+    """
+    Fold the complete lines appended after offset into writes
+
+    Args:
+        check: Bytes expected just before offset, as recorded when offset was cached
+
+    Returns:
+        Offset just past the last complete line, or None if the file no longer starts
+        as cached or older history is needed
+    """
+    if mm[offset - len(check):offset] != check:
+        return None
+
+    # Leave a partially written last line for the next call
+    end = mm.rfind(b"\n", offset) + 1 or offset
+    for line in _iter_marked_lines(mm, offset, end):
+        try:
+            entry = hook_utils.json_loads(line)
+        except ValueError:
+            continue
+        if not _apply_entry(entry, writes):
+            return None
+    return end
+
+
+def _prune_cache(keep: str) -> None:
+    """Remove cache files in CACHE_DIR, other than keep, not written for CACHE_MAX_AGE"""
+    cutoff = time.time() - CACHE_MAX_AGE
+    try:
+        with os.scandir(CACHE_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.path != keep and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+
 def parse_latest_todos(transcript_path: str) -> Optional[List[Dict[str, Any]]]:
     """
     Parse the transcript to find the latest todo list
     Only considers TodoWrite calls that were not rejected
 
+    Parse state is cached per transcript (keyed by inode and size) in CACHE_DIR,
+    so later calls only parse the lines appended since the previous one. Cache
+    files unused for CACHE_MAX_AGE are pruned whenever a new one is created.
+
     Args:
         transcript_path: Path to the session transcript JSONL file
 
@@ -32,51 +226,70 @@ def parse_latest_todos(transcript_path: str) -> Optional[List[Dict[str, Any]]]:
     if not os.path.exists(transcript_path):
         return None
 
-    todos = None
-    rejected_tool_ids = set()
+    cache_path = os.path.join(CACHE_DIR, hashlib.sha256(transcript_path.encode()).hexdigest() + ".json")
+    writes = None
 
     try:
-        # First pass: collect all rejected tool IDs
-        with open(transcript_path, 'r') as f:
-            for line in f:
-                try:
-                    entry = json.loads(line)
-                    message = entry.get("message", {})
-                    content = message.get("content", [])
-
-                    for item in content:
-                        if isinstance(item, dict) and item.get("type") == "tool_result":
-                            # Check if this tool result indicates rejection
-                            error = item.get("content")
-                            tool_use_id = item.get("tool_use_id")
-                            if error and "doesn't want to proceed" in str(error) and tool_use_id:
-                                rejected_tool_ids.add(tool_use_id)
-                except json.JSONDecodeError:
-                    continue
-
-        # Second pass: find latest non-rejected TodoWrite
-        with open(transcript_path, 'r') as f:
-            for line in f:
+        with open(transcript_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if st.st_size == 0:
+                return None
+            # Map the transcript instead of reading it, so only lines with a marker are copied
+            with mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ) as mm:
                 try:
-                    entry = json.loads(line)
-                    message = entry.get("message", {})
-                    content = message.get("content", [])
-
-                    for item in content:
-                        if isinstance(item, dict) and item.get("type") == "tool_use" and item.get("name") == "TodoWrite":
-                            tool_id = item.get("id")
-                            # Only use this TodoWrite if it wasn't rejected
-                            if tool_id not in rejected_tool_ids:
-                                input_data = item.get("input", {})
-                                extracted = input_data.get("todos")
-                                if extracted is not None:  # Allow empty lists
-                                    todos = extracted
-                except json.JSONDecodeError:
-                    continue
+                    os.makedirs(CACHE_DIR, exist_ok=True)
+                    fd = os.open(cache_path, os.O_RDWR | os.O_CREAT, 0o600)
+                except OSError:
+                    # The cache is an optimization only; scan without it
+                    latest = _find_latest_todo_write(mm)
+                    return latest[1] if latest else None
+
+                with os.fdopen(fd, 'rb+') as cache_file:
+                    # Held across parse and write so concurrent hooks don't interleave state
+                    hook_utils.acquire_lock(cache_file)
+                    try:
+                        raw = cache_file.read()
+                        try:
+                            cache = hook_utils.json_loads(raw or b"{}")
+                        except ValueError:
+                            cache = {}
+
+                        offset = None
+                        if (cache.get("path") == transcript_path and cache.get("inode") == st.st_ino
+                                and cache.get("size", st.st_size + 1) <= st.st_size):
+                            writes = cache.get("writes", [])
+                            check = bytes.fromhex(cache.get("check", ""))
+                            offset = _parse_appended(mm, cache["size"], check, writes)
+
+                        if offset is None:
+                            # No usable state: find the latest call from EOF instead of parsing everything
+                            latest = _find_latest_todo_write(mm)
+                            writes = [latest] if latest else []
+                            offset = st.st_size
+
+                        check = mm[max(0, offset - CACHE_CHECK_BYTES):offset]
+                        cache_file.seek(0)
+                        cache_file.truncate()
+                        # Don't resume from inside a partially written last line
+                        if check.endswith(b"\n"):
+                            cache_file.write(hook_utils.json_dumps({
+                                "path": transcript_path,
+                                "inode": st.st_ino,
+                                "size": offset,
+                                "check": check.hex(),
+                                "writes": writes,
+                            }).encode())
+                        cache_file.flush()
+                    finally:
+                        hook_utils.release_lock(cache_file)
+
+                if not raw:
+                    # A new transcript; the cheap moment to sweep out those of ended sessions
+                    _prune_cache(cache_path)
     except Exception as e:
         print(f"Error parsing transcript: {e}", file=sys.stderr)
 
-    return todos
+    return writes[-1][1] if writes else None
 
 
 def extract_todos_from_transcript_entry(entry: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
@@ -102,11 +315,14 @@ def extract_todos_from_transcript_entry(entry: Dict[str, Any]) -> Optional[List[
     content = message.get("content", [])
 
     for item in content:
-        if isinstance(item, dict) and item.get("type") == "tool_use" and item.get("name") == "TodoWrite":
-            input_data = item.get("input", {})
-            todos = input_data.get("todos")
-            if todos:
-                return todos
+        try:
+            if item["type"] != "tool_use" or item["name"] != "TodoWrite":
+                continue
+            todos = item["input"].get("todos")
+        except (TypeError, KeyError, AttributeError):
+            continue
+        if todos:
+            return todos
 
     return None
 
@@ -148,14 +364,16 @@ def create_block_decision(pending_todos: List[Dict[str, Any]], max_display: int
     Returns:
         JSON decision object
     """
-    pending_list = "\n".join([
+    # Only the displayed todos are formatted, however long the list is
+    pending_list = "\n".join(
         f"- {t.get('content', 'Unknown task')}"
-        for t in pending_todos[:max_display]
-    ])
+        for t in islice(pending_todos, max_display)
+    )
+    pending_count = len(pending_todos)
 
     reason = f"""<system>This is an automated message. The todo list is still full. Please continue. If in the very rare circumstance user must respond, then clear the todo list and wait</system>
 
-{len(pending_todos)} incomplete tasks remaining:
+{pending_count} incomplete tasks remaining:
 {pending_list}"""
 
     return {
@@ -167,15 +385,12 @@ def create_block_decision(pending_todos: List[Dict[str, Any]], max_display: int
 def update_session_activity(session_id: str) -> None:
     """
     Update the session's last activity timestamp in global tracking
+    Back-to-back stops within hook_utils.TOUCH_MIN_INTERVAL are coalesced into one write
 
     Args:
         session_id: The Claude session ID
     """
-    updates = {
-        "last_activity": time.time(),
-        "status": "running"
-    }
-    hook_utils.update_session(session_id, updates)
+    hook_utils.touch_session(session_id)
 
 
 def should_skip_hook(stop_hook_active: bool) -> bool:
@@ -194,7 +409,7 @@ def should_skip_hook(stop_hook_active: bool) -> bool:
 def main():
     """Main hook execution"""
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_utils.read_hook_input()
 
         session_id = input_data.get("session_id")
         transcript_path = input_data.get("transcript_path", "")
@@ -217,7 +432,7 @@ def main():
         if pending_todos:
             # Block stopping and request continuation
             output = create_block_decision(pending_todos)
-            print(json.dumps(output))
+            hook_utils.write_hook_output(output)
             sys.exit(0)
 
         # No pending todos - update tracking and allow stopping
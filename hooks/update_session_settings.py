@@ -8,10 +8,7 @@ Usage:
 """
 
 import sys
-from pathlib import Path
 
-# Add to path
-sys.path.insert(0, str(Path(__file__).parent))
 import session_settings
 
 def main():
@@ -41,21 +38,25 @@ def main():
         print(f"✓ {hook_name}: {'enabled' if enabled else 'disabled'}")
 
     elif command == "fix_defaults":
-        # Ensure correct defaults
+        # Ensure correct defaults in a single settings write
         settings = session_settings.load_settings(session_id)
+        patch = {
+            "hooks_enabled": {
+                hook_name: True
+                for hook_name in ["stop-hook", "notification-hook", "session-start", "session-end"]
+            }
+        }
 
         # Fix approval_mode if not set or invalid
         approval_mode = settings.get("metadata", {}).get("approval_mode")
         if not approval_mode or approval_mode == "not_set":
-            session_settings.set_metadata(session_id, "approval_mode", "ai")
-            print("✓ Fixed approval_mode to: ai")
+            patch["metadata"] = {"approval_mode": "ai"}
 
-        # Fix hooks if any are disabled
-        hooks = settings.get("hooks_enabled", {})
-        for hook_name in ["stop-hook", "notification-hook", "session-start", "session-end"]:
-            if not hooks.get(hook_name, False):
-                session_settings.set_hook_enabled(session_id, hook_name, True)
-                print(f"✓ Enabled {hook_name}")
+        changed = session_settings.update_bulk(session_id, patch)
+        if "approval_mode" in changed.get("metadata", {}):
+            print("✓ Fixed approval_mode to: ai")
+        for hook_name in changed.get("hooks_enabled", {}):
+            print(f"✓ Enabled {hook_name}")
 
         print("✓ Defaults fixed")
 
@@ -1181,29 +1181,47 @@ pub async fn list_running_claude_sessions(
 /// Get all global Claude sessions tracked by hooks
 #[tauri::command]
 pub async fn list_global_sessions() -> Result<Vec<GlobalSession>, String> {
-    // Read the global sessions JSON file
-    let global_sessions_path = dirs::home_dir()
+    // Sessions are written by hooks (hook_utils.py) to the global database
+    let db_path = dirs::home_dir()
         .ok_or("Could not find home directory")?
-        .join("local/global/claude-sessions.json");
+        .join("local/global/claude.db");
 
-    // Check if file exists
-    if !global_sessions_path.exists() {
+    // Hooks create the database, migrating any legacy JSON files, on their first run
+    if !db_path.exists() {
         return Ok(Vec::new());
     }
 
-    // Read and parse the file
-    let content = fs::read_to_string(&global_sessions_path)
-        .map_err(|e| format!("Failed to read global sessions file: {}", e))?;
-
-    #[derive(Deserialize)]
-    struct GlobalSessionsFile {
-        sessions: Vec<GlobalSession>,
-    }
-
-    let file_data: GlobalSessionsFile = serde_json::from_str(&content)
-        .map_err(|e| format!("Failed to parse global sessions JSON: {}", e))?;
+    let conn = rusqlite::Connection::open_with_flags(
+        &db_path,
+        rusqlite::OpenFlags::SQLITE_OPEN_READ_ONLY | rusqlite::OpenFlags::SQLITE_OPEN_NO_MUTEX,
+    )
+    .map_err(|e| format!("Failed to open global sessions database: {}", e))?;
+
+    let mut stmt = conn
+        .prepare(
+            "SELECT session_id, cwd, transcript_path, permission_mode, status, \
+             started_at, last_activity, last_notification \
+             FROM sessions ORDER BY started_at",
+        )
+        .map_err(|e| format!("Failed to query global sessions: {}", e))?;
+
+    let result = stmt
+        .query_map([], |row| {
+            Ok(GlobalSession {
+                session_id: row.get(0)?,
+                cwd: row.get(1)?,
+                transcript_path: row.get(2)?,
+                permission_mode: row.get(3)?,
+                status: row.get(4)?,
+                started_at: row.get(5)?,
+                last_activity: row.get(6)?,
+                last_notification: row.get(7)?,
+            })
+        })
+        .and_then(|rows| rows.collect::<Result<Vec<_>, _>>())
+        .map_err(|e| format!("Failed to read global sessions: {}", e))?;
 
-    Ok(file_data.sessions)
+    Ok(result)
 }
 
 /// Get live output from a Claude session
@@ -1,5 +1,8 @@
 """LangChain-based LLM utility supporting multiple providers with retries.
 
+When httpx is installed, requests are sent straight to the provider HTTP APIs with
+plain JSON bodies; set LLM_DIRECT=0 to force the LangChain path instead.
+
 Available Models (Updated October 2025):
 
 OpenAI models:
@@ -27,42 +30,206 @@ Claude models (Anthropic):
 from __future__ import annotations
 
 import argparse
+import functools
+import json
 import os
+import random
+import re
 import sys
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 try:  # Optional dependency
-    from langchain_openai import ChatOpenAI
+    import httpx
 except ImportError:  # pragma: no cover - optional dependency
-    ChatOpenAI = None  # type: ignore
+    httpx = None  # type: ignore
 
 try:  # Optional dependency
-    from langchain_google_genai import ChatGoogleGenerativeAI
+    import orjson
 except ImportError:  # pragma: no cover - optional dependency
-    ChatGoogleGenerativeAI = None  # type: ignore
+    orjson = None  # type: ignore
 
-try:  # Optional dependency
-    from langchain_anthropic import ChatAnthropic
-except ImportError:  # pragma: no cover - optional dependency
-    ChatAnthropic = None  # type: ignore
+# LangChain is imported lazily: provider classes in _create_client, message
+# classes by _load_message_classes or the module __getattr__, so each run only
+# loads what it uses
+_MESSAGE_CLASSES = ("AIMessage", "BaseMessage", "HumanMessage", "SystemMessage")
 
-try:  # Optional dependency
-    from langchain_core.messages import (
-        AIMessage,
-        BaseMessage,
-        HumanMessage,
-        SystemMessage,
-    )
-except ImportError:  # pragma: no cover - optional dependency
-    AIMessage = BaseMessage = HumanMessage = SystemMessage = None  # type: ignore
+
+# Environment variable holding the API key for each provider
+API_KEY_ENV = {
+    "openai": "OPENAI_API_KEY",
+    "grok": "XAI_API_KEY",
+    "gemini": "GOOGLE_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+}
+
+# Request timeout in seconds for the shared HTTP client
+HTTP_TIMEOUT = 60.0
+
+# Idle keep-alive connections kept open by the shared HTTP client
+HTTP_MAX_KEEPALIVE = 4
+
+# OpenAI reasoning models (o-series, gpt-5) reject any temperature but the default
+_OPENAI_REASONING_MODEL = re.compile(r"^(o\d|gpt-5)", re.IGNORECASE)
+
+JSON_ONLY_INSTRUCTION = "\n\nIMPORTANT: Return valid JSON only, no other text."
+
+# KEY=value lines of an env file; the value may be single- or double-quoted
+_ENV_LINE = re.compile(
+    r"""^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"""
+    r"""(?:"([^"\n]*)"|'([^'\n]*)'|(.*?))[ \t]*\r?$""",
+    re.MULTILINE,
+)
+
+# Parsed env files by path: (st_mtime_ns, variables)
+_ENV_CACHE: Dict[str, Tuple[int, Dict[str, str]]] = {}
+
+# Attempts per request and the bounds of the jittered delay between them, in seconds
+RETRY_ATTEMPTS = 7
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# HTTP statuses worth retrying (timeouts, conflicts, rate limits); 5xx are always retried
+RETRYABLE_STATUSES = frozenset({408, 409, 429})
+
+# Provider SDK connection/timeout errors without a status, matched by class name so the
+# SDKs need not be imported here (openai and anthropic both define APIConnectionError,
+# the base of their APITimeoutError)
+TRANSIENT_ERROR_NAMES = frozenset({"APIConnectionError"})
 
 
 def eprint(*args: Any, **kwargs: Any) -> None:
     print(*args, file=sys.stderr, **kwargs)
 
 
+@functools.lru_cache(maxsize=None)
+def shared_http_client() -> Any:
+    """Process-wide httpx client, so every request and retry reuses pooled keep-alive connections.
+
+    Returns None when httpx is not installed.
+    """
+    if httpx is None:
+        return None
+    limits = httpx.Limits(max_keepalive_connections=HTTP_MAX_KEEPALIVE)
+    try:
+        return httpx.Client(http2=True, limits=limits, timeout=HTTP_TIMEOUT)
+    except ImportError:  # HTTP/2 needs the optional `h2` package
+        return httpx.Client(limits=limits, timeout=HTTP_TIMEOUT)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_message_classes() -> Any:
+    """Import the LangChain message module on first use and return it."""
+    try:
+        from langchain_core import messages
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("Install `langchain` to build LangChain message objects.") from exc
+    return messages
+
+
+def detect_provider(model: str) -> str:
+    """Infer the provider serving a model from its name."""
+    lower_model = model.lower()
+    if "gemini" in lower_model:
+        return "gemini"
+    if "grok" in lower_model:
+        return "grok"
+    if "claude" in lower_model or "anthropic" in lower_model:
+        return "anthropic"
+    return "openai"
+
+
+def _error_status(exc: Exception) -> Optional[int]:
+    """HTTP status carried by an httpx or provider SDK error, or None if it has none."""
+    response = getattr(exc, "response", None)
+    for status in (
+        getattr(exc, "status_code", None),
+        getattr(response, "status_code", None),
+        getattr(exc, "code", None),  # google.api_core errors
+    ):
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Whether a status-less error is a transport failure or timeout worth retrying."""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    if httpx is not None and isinstance(exc, httpx.TransportError):
+        return True
+    return any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(exc).__mro__)
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Seconds to wait from the error response's Retry-After header, if present."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _json_loads(data: str | bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def call_with_retries(call: Callable[[], str]) -> str:
+    """Run a provider call, retrying transient failures with jittered backoff.
+
+    Only rate limits, 5xx and other RETRYABLE_STATUSES, and status-less
+    transport failures and timeouts are retried; anything else (bad request,
+    auth, malformed responses, ...) is raised immediately. A Retry-After
+    header is honored up to RETRY_MAX_DELAY.
+    """
+    delay = RETRY_BASE_DELAY
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            return call()
+        except Exception as exc:  # pragma: no cover - network / SDK errors
+            status = _error_status(exc)
+            if status is None:
+                retryable = _is_transient(exc)
+            else:
+                retryable = status >= 500 or status in RETRYABLE_STATUSES
+            if not retryable or attempt == RETRY_ATTEMPTS - 1:
+                raise
+            # Decorrelated jitter keeps concurrent clients from retrying in lockstep
+            delay = random.uniform(RETRY_BASE_DELAY, min(delay * 3, RETRY_MAX_DELAY))
+            wait = _retry_after(exc)
+            wait = delay if wait is None else min(wait, RETRY_MAX_DELAY)
+            eprint(f"⚠️  Request failed: {exc}. Retrying in {wait:.1f}s...")
+            time.sleep(wait)
+    return ""
+
+
+def stream_with_retries(open_stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+    """Yield tokens from a provider stream, retrying until the first token arrives.
+
+    Once output has started, errors propagate instead of restarting the stream.
+    """
+    tokens: Iterator[str] = iter(())
+
+    def first_token() -> str:
+        nonlocal tokens
+        tokens = open_stream()
+        return next(tokens, "")
+
+    first = call_with_retries(first_token)
+    if first:
+        yield first
+    yield from tokens
+
+
 def load_env_file(path: str = ".env.local") -> None:
     """Load environment variables from a simple .env file if present."""
     # If path is relative, look for it in the script's directory
@@ -70,23 +237,28 @@ def load_env_file(path: str = ".env.local") -> None:
         script_dir = os.path.dirname(os.path.abspath(__file__))
         path = os.path.join(script_dir, path)
 
-    if not os.path.exists(path):
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
         return
 
-    try:
-        with open(path, "r", encoding="utf-8") as handle:
-            for raw_line in handle:
-                line = raw_line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                if "=" not in line:
-                    continue
-                key, value = line.split("=", 1)
-                key = key.strip()
-                value = value.strip().strip('"').strip("'")
-                os.environ.setdefault(key, value)
-    except OSError as exc:
-        eprint(f"⚠️  Could not read {path}: {exc}")
+    # Reparse only when the file changed since it was last loaded in this process
+    cached = _ENV_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                text = handle.read()
+        except OSError as exc:
+            eprint(f"⚠️  Could not read {path}: {exc}")
+            return
+        variables: Dict[str, str] = {}
+        for match in _ENV_LINE.finditer(text):
+            value = next(v for v in match.group(2, 3, 4) if v is not None)
+            variables.setdefault(match.group(1), value)
+        cached = _ENV_CACHE[path] = (mtime, variables)
+
+    for key, value in cached[1].items():
+        os.environ.setdefault(key, value)
 
 
 load_env_file()
@@ -104,24 +276,22 @@ class LangChainLLMClient:
     def __init__(self, config: LangChainLLMConfig):
         self.config = config
         self.model = config.model
-        lower_model = self.model.lower()
-
-        self.provider = "openai"
-        if "gemini" in lower_model:
-            self.provider = "gemini"
-        elif "grok" in lower_model:
-            self.provider = "grok"
-        elif "claude" in lower_model or "anthropic" in lower_model:
-            self.provider = "anthropic"
-
+        self.provider = detect_provider(self.model)
+        # Provider capabilities, resolved once instead of on every call
+        self._json_mode = self.provider in {"openai", "grok"}
+        self._needs_json_suffix = self.provider in {"gemini", "anthropic"}
+        # Recent message objects by (role, content), so e.g. a fixed system prompt is built once
+        self._make_message = functools.lru_cache(maxsize=4)(self._new_message)
         self.client = self._create_client()
 
     def _create_client(self):
         if self.provider == "gemini":
-            if ChatGoogleGenerativeAI is None:
+            try:
+                from langchain_google_genai import ChatGoogleGenerativeAI
+            except ImportError as exc:  # pragma: no cover - optional dependency
                 raise RuntimeError(
                     "Install `langchain-google-genai` to use Gemini models."
-                )
+                ) from exc
             api_key = os.environ.get("GOOGLE_API_KEY")
             if not api_key:
                 raise RuntimeError("GOOGLE_API_KEY is required for Gemini models.")
@@ -133,8 +303,10 @@ class LangChainLLMClient:
             )
 
         if self.provider == "grok":
-            if ChatOpenAI is None:
-                raise RuntimeError("Install `langchain-openai` to use Grok models.")
+            try:
+                from langchain_openai import ChatOpenAI
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError("Install `langchain-openai` to use Grok models.") from exc
             api_key = os.environ.get("XAI_API_KEY")
             if not api_key:
                 raise RuntimeError("XAI_API_KEY is required for Grok models.")
@@ -144,13 +316,16 @@ class LangChainLLMClient:
                 max_tokens=self.config.max_tokens,
                 api_key=api_key,
                 base_url="https://api.x.ai/v1",
+                **self._http_client_kwargs(),
             )
 
         if self.provider == "anthropic":
-            if ChatAnthropic is None:
+            try:
+                from langchain_anthropic import ChatAnthropic
+            except ImportError as exc:  # pragma: no cover - optional dependency
                 raise RuntimeError(
                     "Install `langchain-anthropic` to use Claude models."
-                )
+                ) from exc
             api_key = os.environ.get("ANTHROPIC_API_KEY")
             if not api_key:
                 raise RuntimeError("ANTHROPIC_API_KEY is required for Claude models.")
@@ -161,8 +336,10 @@ class LangChainLLMClient:
                 api_key=api_key,
             )
 
-        if ChatOpenAI is None:
-            raise RuntimeError("Install `langchain-openai` to use OpenAI models.")
+        try:
+            from langchain_openai import ChatOpenAI
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("Install `langchain-openai` to use OpenAI models.") from exc
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY is required for OpenAI-compatible models.")
@@ -171,70 +348,254 @@ class LangChainLLMClient:
             temperature=self.config.temperature,
             max_tokens=self.config.max_tokens,
             api_key=api_key,
+            **self._http_client_kwargs(),
         )
 
+    def _http_client_kwargs(self) -> Dict[str, Any]:
+        # The OpenAI SDK accepts an httpx client, so OpenAI and Grok share the pooled one
+        http_client = shared_http_client()
+        return {"http_client": http_client} if http_client is not None else {}
+
     def chat(self, messages: List[Dict[str, str]], response_format_json: bool = False) -> str:
         """Send chat messages and return the assistant response text."""
         payload = self._convert_messages(messages, response_format_json)
-        backoff = 1.0
-        for attempt in range(7):
-            try:
-                response = self._invoke(payload, response_format_json)
-                return self._extract_text(response)
-            except Exception as exc:  # pragma: no cover - network / SDK errors
-                if attempt == 6:
-                    raise
-                eprint(f"⚠️  Request failed: {exc}. Retrying in {backoff:.1f}s...")
-                time.sleep(backoff)
-                backoff = min(backoff * 2, 16.0)
-        return ""
+        return call_with_retries(
+            lambda: self._extract_text(self._invoke(payload, response_format_json))
+        )
 
-    def _invoke(self, payload: Iterable[Any], response_format_json: bool):
+    def stream(
+        self, messages: List[Dict[str, str]], response_format_json: bool = False
+    ) -> Iterator[str]:
+        """Send chat messages and yield the response text as it is generated."""
+        payload = self._convert_messages(messages, response_format_json)
+
+        def open_stream() -> Iterator[str]:
+            for chunk in self.client.stream(payload, **self._call_kwargs(response_format_json)):
+                text = self._chunk_text(chunk)
+                if text:
+                    yield text
+
+        return stream_with_retries(open_stream)
+
+    def _call_kwargs(self, response_format_json: bool) -> Dict[str, Any]:
         call_kwargs: Dict[str, Any] = {}
-        if response_format_json and self.provider in {"openai", "grok"}:
+        if response_format_json and self._json_mode:
             call_kwargs["response_format"] = {"type": "json_object"}
-        return self.client.invoke(payload, **call_kwargs)
+        return call_kwargs
+
+    def _invoke(self, payload: Iterable[Any], response_format_json: bool):
+        return self.client.invoke(payload, **self._call_kwargs(response_format_json))
+
+    def _chunk_text(self, chunk: Any) -> str:
+        content = getattr(chunk, "content", "")
+        if isinstance(content, str):
+            return content
+        # Anthropic chunks carry a list of content blocks
+        return "".join(
+            part.get("text", "") for part in content if isinstance(part, dict)
+        )
 
     def _convert_messages(
         self, messages: List[Dict[str, str]], response_format_json: bool
     ) -> List[Any]:
-        if SystemMessage is None or HumanMessage is None or AIMessage is None:
-            raise RuntimeError("Install `langchain` to build LangChain message objects.")
-        converted: List[Any] = []
+        add_suffix = response_format_json and self._needs_json_suffix
+        resolved: List[Tuple[str, str]] = []
         appended_json_instruction = False
         for message in messages:
             role = message.get("role", "user")
             content = message.get("content", "")
-            if response_format_json and role == "user" and self.provider in {"gemini", "anthropic"}:
-                content = f"{content}\n\nIMPORTANT: Return valid JSON only, no other text."
+            if add_suffix and role == "user":
+                content = f"{content}{JSON_ONLY_INSTRUCTION}"
                 appended_json_instruction = True
-            if role == "system":
-                converted.append(SystemMessage(content=content))
-            elif role == "assistant":
-                converted.append(AIMessage(content=content))
-            else:
-                converted.append(HumanMessage(content=content))
+            resolved.append((role, content))
+
+        if add_suffix and not appended_json_instruction and resolved:
+            role, content = resolved[-1]
+            resolved[-1] = (role, f"{content}{JSON_ONLY_INSTRUCTION}")
 
-        if (
-            response_format_json
-            and self.provider in {"gemini", "anthropic"}
-            and not appended_json_instruction
-            and converted
-        ):
-            last = converted[-1]
-            if hasattr(last, "content"):
-                last.content = f"{last.content}\n\nIMPORTANT: Return valid JSON only, no other text."
+        # Cached messages are shared between calls, so they are never modified after creation
+        return [self._make_message(role, content) for role, content in resolved]
 
-        return converted
+    def _new_message(self, role: str, content: str) -> Any:
+        messages = _load_message_classes()
+        if role == "system":
+            return messages.SystemMessage(content=content)
+        if role == "assistant":
+            return messages.AIMessage(content=content)
+        return messages.HumanMessage(content=content)
 
     def _extract_text(self, response: Any) -> str:
-        if BaseMessage is not None and isinstance(response, BaseMessage):
+        if isinstance(response, _load_message_classes().BaseMessage):
             return getattr(response, "content", "") or ""
         if isinstance(response, dict):
             return str(response)
         return str(response)
 
 
+class DirectLLMClient:
+    """Direct HTTP client for the same providers, bypassing LangChain entirely."""
+
+    def __init__(self, config: LangChainLLMConfig):
+        self.config = config
+        self.model = config.model
+        self.provider = detect_provider(self.model)
+        self._needs_json_suffix = self.provider in {"gemini", "anthropic"}
+
+        if httpx is None:
+            raise RuntimeError("Install `httpx` to use direct provider calls.")
+        self.api_key = os.environ.get(API_KEY_ENV[self.provider])
+        if not self.api_key:
+            raise RuntimeError(
+                f"{API_KEY_ENV[self.provider]} is required for {self.provider} models."
+            )
+
+        self._http = shared_http_client()
+
+    def chat(self, messages: List[Dict[str, str]], response_format_json: bool = False) -> str:
+        """Send chat messages and return the assistant response text."""
+        url, headers, body = self._build_request(messages, response_format_json)
+
+        def call() -> str:
+            response = self._http.post(url, json=body, headers=headers)
+            response.raise_for_status()
+            return self._extract_text(_json_loads(response.content))
+
+        return call_with_retries(call)
+
+    def stream(
+        self, messages: List[Dict[str, str]], response_format_json: bool = False
+    ) -> Iterator[str]:
+        """Send chat messages and yield the response text as it is generated."""
+        url, headers, body = self._build_request(messages, response_format_json, stream=True)
+
+        def open_stream() -> Iterator[str]:
+            with self._http.stream("POST", url, json=body, headers=headers) as response:
+                response.raise_for_status()
+                # Server-sent events: one JSON payload per "data:" line
+                for line in response.iter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    text = self._extract_delta(_json_loads(data))
+                    if text:
+                        yield text
+
+        return stream_with_retries(open_stream)
+
+    def _build_request(
+        self, messages: List[Dict[str, str]], response_format_json: bool, stream: bool = False
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Return the URL, headers, and JSON body of a provider request."""
+        if response_format_json and self._needs_json_suffix:
+            # These providers have no JSON mode here; ask for it in the prompt instead
+            messages = [
+                {**m, "content": m.get("content", "") + JSON_ONLY_INSTRUCTION}
+                if m.get("role", "user") == "user" else m
+                for m in messages
+            ]
+        system = "\n\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+        chat = [m for m in messages if m.get("role") != "system"]
+
+        if self.provider == "anthropic":
+            body: Dict[str, Any] = {
+                "model": self.model,
+                "max_tokens": self.config.max_tokens,
+                "temperature": self.config.temperature,
+                "messages": [
+                    {"role": m.get("role", "user"), "content": m.get("content", "")} for m in chat
+                ],
+            }
+            if system:
+                body["system"] = system
+            if stream:
+                body["stream"] = True
+            headers = {"x-api-key": self.api_key, "anthropic-version": "2023-06-01"}
+            return "https://api.anthropic.com/v1/messages", headers, body
+
+        if self.provider == "gemini":
+            body = {
+                "contents": [
+                    {
+                        "role": "model" if m.get("role") == "assistant" else "user",
+                        "parts": [{"text": m.get("content", "")}],
+                    }
+                    for m in chat
+                ],
+                "generationConfig": {
+                    "temperature": self.config.temperature,
+                    "maxOutputTokens": self.config.max_tokens,
+                },
+            }
+            if system:
+                body["systemInstruction"] = {"parts": [{"text": system}]}
+            method = "streamGenerateContent?alt=sse" if stream else "generateContent"
+            url = (
+                "https://generativelanguage.googleapis.com/v1beta/models/"
+                f"{self.model}:{method}"
+            )
+            return url, {"x-goog-api-key": self.api_key}, body
+
+        # OpenAI and Grok share the chat completions API
+        body = {
+            "model": self.model,
+            "messages": [
+                {"role": m.get("role", "user"), "content": m.get("content", "")}
+                for m in messages
+            ],
+        }
+        if self.provider == "openai":
+            # OpenAI deprecated max_tokens; reasoning models reject it outright
+            body["max_completion_tokens"] = self.config.max_tokens
+            if not _OPENAI_REASONING_MODEL.match(self.model):
+                body["temperature"] = self.config.temperature
+        else:
+            body["max_tokens"] = self.config.max_tokens
+            body["temperature"] = self.config.temperature
+        if response_format_json:
+            body["response_format"] = {"type": "json_object"}
+        if stream:
+            body["stream"] = True
+        base_url = "https://api.x.ai/v1" if self.provider == "grok" else "https://api.openai.com/v1"
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        return f"{base_url}/chat/completions", headers, body
+
+    def _extract_text(self, data: Dict[str, Any]) -> str:
+        if self.provider == "anthropic":
+            return "".join(
+                block.get("text", "") for block in data.get("content", [])
+                if block.get("type") == "text"
+            )
+        if self.provider == "gemini":
+            candidates = data.get("candidates") or [{}]
+            parts = candidates[0].get("content", {}).get("parts", [])
+            return "".join(part.get("text", "") for part in parts)
+        choices = data.get("choices") or [{}]
+        return choices[0].get("message", {}).get("content") or ""
+
+    def _extract_delta(self, event: Dict[str, Any]) -> str:
+        if self.provider == "anthropic":
+            if event.get("type") != "content_block_delta":
+                return ""
+            return event.get("delta", {}).get("text", "")
+        if self.provider == "gemini":
+            # Each streamed Gemini event is a partial generateContent response
+            return self._extract_text(event)
+        choices = event.get("choices") or [{}]
+        return choices[0].get("delta", {}).get("content") or ""
+
+
+def create_client(config: LangChainLLMConfig) -> LangChainLLMClient | DirectLLMClient:
+    """Build the client for config: direct HTTP when httpx is available, LangChain otherwise.
+
+    LLM_DIRECT=0 forces the LangChain client even when httpx is installed.
+    """
+    if httpx is not None and os.environ.get("LLM_DIRECT") != "0":
+        return DirectLLMClient(config)
+    return LangChainLLMClient(config)
+
+
 def build_messages(system: str | None, user: str) -> List[Dict[str, str]]:
     convo: List[Dict[str, str]] = []
     if system:
@@ -259,6 +620,11 @@ def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Request JSON-formatted response when provider supports it",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the response as it is generated (default when stdout is a TTY)",
+    )
     return parser.parse_args(list(argv) if argv is not None else None)
 
 
@@ -287,13 +653,29 @@ def main(argv: Iterable[str] | None = None) -> int:
         thinking_budget=args.thinking_budget,
     )
 
-    client = LangChainLLMClient(config)
+    client = create_client(config)
     messages = build_messages(args.system, user_content)
+
+    # JSON output is only useful once complete, so it is always buffered
+    if (args.stream or sys.stdout.isatty()) and not args.json:
+        for token in client.stream(messages):
+            sys.stdout.write(token)
+            sys.stdout.flush()
+        sys.stdout.write("\n")
+        return 0
+
     response = client.chat(messages, response_format_json=args.json)
     print(response)
     return 0
 
 
+def __getattr__(name: str) -> Any:
+    """Resolve the LangChain message classes on first attribute access (PEP 562)."""
+    if name in _MESSAGE_CLASSES:
+        return getattr(_load_message_classes(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":  # pragma: no cover - CLI entry point
     try:
         raise SystemExit(main())